@@ -3,12 +3,15 @@ This example cog demonstrates basic usage of Lavalink.py, using the DefaultPlaye
 As this example primarily showcases usage in conjunction with discord.py, you will need to make
 modifications as necessary for use with another Discord library.
 
-Usage of this cog requires Python 3.6 or higher due to the use of f-strings.
-Compatibility with Python 3.5 should be possible if f-strings are removed.
+Usage of this cog requires Python 3.9 or higher, as the blocking Spotify and Genius clients are
+run in worker threads through `asyncio.to_thread`.
 """
 import re
 import math
-from pprint import pprint
+import asyncio
+import logging
+from collections import OrderedDict
+from itertools import islice
 
 import discord
 import lavalink
@@ -18,7 +21,56 @@ from discord import Spotify
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 
-url_rx = re.compile(r'https?://(?:www\.)?.+')
+log = logging.getLogger(__name__)
+
+# A plain prefix check is all that's needed to tell URLs from search terms.
+url_prefixes = ('http://', 'https://')
+# Upper bound on the number of concurrent Lavalink lookups made while enqueueing a playlist.
+playlist_concurrency = 10
+# Spotify links/URIs are classified locally so that non-Spotify queries never hit the Spotify API.
+spotify_track_rx = re.compile(r'(?:open\.spotify\.com/(?:intl-[\w-]+/)?track/|spotify:track:)([A-Za-z0-9]+)')
+spotify_playlist_rx = re.compile(r'(?:open\.spotify\.com/(?:intl-[\w-]+/)?playlist/|spotify:playlist:)([A-Za-z0-9]+)')
+# Lowercased words stripped from track titles before they are used as a lyrics search.
+lyric_stopwords = frozenset({'(lyrics)', 'lyrics', 'official', 'video', '(official', 'video)', '(audio)'})
+# Lavalink results for recently resolved queries, most recently used last.
+track_cache = OrderedDict()
+track_cache_size = 2048
+cacheable_load_types = ('TRACK_LOADED', 'PLAYLIST_LOADED', 'SEARCH_RESULT')
+search_prefixes = ('ytsearch:', 'scsearch:')
+
+
+def track_cache_key(query):
+    """ Normalizes a query so that searches differing only in case or whitespace share a cache entry. """
+    query = query.strip()
+    for prefix in search_prefixes:
+        if query.startswith(prefix):
+            # Only the search terms are case insensitive; URLs are kept as they are.
+            return prefix + ' '.join(query[len(prefix):].casefold().split())
+    return query
+
+
+async def get_tracks_cached(node, query):
+    """
+    Returns the Lavalink results for a query, reusing the results of earlier equivalent queries.
+    The results are shared with the cache and must not be modified; `tracks` is a tuple for that reason.
+    """
+    key = track_cache_key(query)
+    results = track_cache.get(key)
+
+    if results is not None:
+        track_cache.move_to_end(key)
+        return results
+
+    results = await node.get_tracks(query)
+
+    # Failed lookups and empty searches aren't cached so they can be retried.
+    if results and results['tracks'] and results['loadType'] in cacheable_load_types:
+        results = {**results, 'tracks': tuple(results['tracks'])}
+        track_cache[key] = results
+        if len(track_cache) > track_cache_size:
+            track_cache.popitem(last=False)
+
+    return results
 
 
 class LavalinkVoiceClient(discord.VoiceClient):
@@ -100,6 +152,15 @@ class Music(commands.Cog):
 
         lavalink.add_event_hook(self.track_hook)
 
+        # Build the API clients once so their OAuth token and HTTP session are reused across commands.
+        client_credentials_manager = SpotifyClientCredentials(client_id=,
+                                                              client_secret=)
+        self.sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+
+        token =
+        self.genius = Genius(token)
+        self.genius.remove_section_headers = True
+
     def cog_unload(self):
         """ Cog unload handler. This removes any event hooks that were registered. """
         self.bot.lavalink._event_hooks.clear()
@@ -111,8 +172,9 @@ class Music(commands.Cog):
         #  except it saves us repeating ourselves (and also a few lines).
 
         if guild_check:
-            await self.ensure_voice(ctx)
+            ctx.player = await self.ensure_voice(ctx)
             #  Ensure that the bot and command author share a mutual voicechannel.
+            #  The guild's player is kept on the context so commands don't have to look it up again.
 
         return guild_check
 
@@ -125,39 +187,47 @@ class Music(commands.Cog):
             # if you want to do things differently.
 
     async def ensure_voice(self, ctx):
-        """ This check ensures that the bot and command author are in the same voicechannel. """
-        player = self.bot.lavalink.player_manager.create(ctx.guild.id, endpoint=str(ctx.guild.region))
-        # Create returns a player if one exists, otherwise creates.
-        # This line is important because it ensures that a player always exists for a guild.
-
-        # Most people might consider this a waste of resources for guilds that aren't playing, but this is
-        # the easiest and simplest way of ensuring players are created.
-
+        """
+        This check ensures that the bot and command author are in the same voicechannel.
+        Returns the guild's player.
+        """
         # These are commands that require the bot to join a voicechannel (i.e. initiating playback).
         # Commands such as volume/skip etc don't require the bot to be in a voicechannel so don't need listing here.
         should_connect = ctx.command.name in ('play', 'search_music', 'playuser', 'join')
 
-        if not ctx.author.voice or not ctx.author.voice.channel:
+        voice = ctx.author.voice
+        if not voice or not voice.channel:
             # Our cog_command_error handler catches this and sends it to the voicechannel.
             # Exceptions allow us to "short-circuit" command invocation via checks so the
             # execution state of the command goes no further.
             raise commands.CommandInvokeError('Join a voicechannel first.')
 
-        if not player.is_connected:
+        channel = voice.channel
+
+        # Look the player up first and only create one for commands that can start playback,
+        # so commands such as volume/queue don't allocate a player for guilds that aren't playing.
+        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        if player is None and should_connect:
+            player = self.bot.lavalink.player_manager.create(ctx.guild.id, endpoint=str(ctx.guild.region))
+
+        if player is None or not player.is_connected:
             if not should_connect:
                 raise commands.CommandInvokeError('Not connected.')
 
-            permissions = ctx.author.voice.channel.permissions_for(ctx.me)
+            # permissions_for walks all of the member's roles, so it's only computed when we need to connect.
+            permissions = channel.permissions_for(ctx.me)
 
             if not permissions.connect or not permissions.speak:  # Check user limit too?
                 raise commands.CommandInvokeError('I need the `CONNECT` and `SPEAK` permissions.')
 
             player.store('channel', ctx.channel.id)
-            await ctx.author.voice.channel.connect(cls=LavalinkVoiceClient)
+            await channel.connect(cls=LavalinkVoiceClient)
         else:
-            if int(player.channel_id) != ctx.author.voice.channel.id:
+            if int(player.channel_id) != channel.id:
                 raise commands.CommandInvokeError('You need to be in my voicechannel.')
 
+        return player
+
     async def track_hook(self, event):
         if isinstance(event, lavalink.events.QueueEndEvent):
             # When this track_hook receives a "QueueEndEvent" from lavalink.py
@@ -165,7 +235,20 @@ class Music(commands.Cog):
             # To save on resources, we can tell the bot to disconnect from the voicechannel.
             guild_id = int(event.player.guild_id)
             guild = self.bot.get_guild(guild_id)
-            await guild.voice_client.disconnect(force=True)
+            # The guild is None if the bot was removed from it, and voice_client is None if it was already
+            # disconnected. Errors must not escape as they would be raised inside lavalink.py's event dispatch.
+            voice_client = getattr(guild, 'voice_client', None)
+            if voice_client is not None:
+                try:
+                    await voice_client.disconnect(force=True)
+                except Exception:
+                    # Keep the player, as the bot may still be connected with it.
+                    log.exception('Failed to disconnect from voice in guild %s', guild_id)
+                    return
+
+            # Destroy the player on the node too, not just in the local cache.
+            # It is recreated by ensure_voice on the next playback command.
+            await self.bot.lavalink.player_manager.destroy(guild_id)
 
     @commands.command()
     async def join(self, ctx):
@@ -174,59 +257,69 @@ class Music(commands.Cog):
     @commands.command(aliases=['p'])
     async def play(self, ctx, *, query):
         """ Searches and plays a song from a given query. """
-        # Get the player for this guild from cache.
-        client_credentials_manager = SpotifyClientCredentials(client_id=,
-                                                              client_secret=)
-        sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        sp = self.sp
+        # The guild's player, looked up by cog_before_invoke.
+        player = ctx.player
         # Remove leading and trailing <>. <> may be used to suppress embedding links in Discord.
-        query = query.strip('<>')
-        global spotify
-        spotify = False
+        query = query.removeprefix('<').removesuffix('>')
 
-        try:
-            print("trying to find the song with the spotify track class")
-            urn = query
-            print(urn)
-            track = sp.track(urn)
+        track_match = spotify_track_rx.search(query)
+        playlist_match = spotify_playlist_rx.search(query) if not track_match else None
+
+        # spotipy is synchronous, so its requests are run in a worker thread to keep the event loop free.
+        if track_match:
+            track = await asyncio.to_thread(sp.track, track_match.group(1))
             query = f'ytsearch:{track["name"]} {track["artists"][0]["name"]}'
-            print(query)
-        except:
-            try:
-                pl_id = f'{query}'
-                offset = 0
-                response = sp.playlist_items(pl_id,
-                                             offset=offset,
-                                             fields='items.track.id,total',
-                                             additional_types=['track'])
-                playlist_size = 50
-                while playlist_size != 0:
-                    playlist_size = playlist_size - 1
-                    songs = response['items'][playlist_size - 1]['track']['id']
-                    track = sp.track(songs)
-                    pprint(f"{track['name']} {track['artists'][0]['name']}")
-                    query = f"ytsearch:{track['name']} {track['artists'][0]['name']}"
-
-                #playlist_link = f"{query}"
-                #playlist_URI = playlist_link.split("/")[-1].split("?")[0]
-                #print("trying to find the song with the spotify playlist class")
-                #for track in sp.playlist_tracks(playlist_URI)["items"]:
-                #    track_name = track["track"]["name"]
-                #    artist_name = track["track"]["artists"][0]["name"]
-                #    query = f'ytsearch:{track_name} {artist_name}'
-                #    player.queue.put(query)
-
-            except:
-        # Check if the user input might be a URL. If it isn't, we can Lavalink do a YouTube search for it instead.
-        # SoundCloud searching is possible by prefixing "scsearch:" instead.
-                if not url_rx.match(query):
-                    try:
-                        query = f'ytsearch:{query}'
-                    except:
-                        query = f'scsearch:{query}'
+            log.debug('Resolved Spotify track to %s', query)
+        elif playlist_match:
+            pl_id = playlist_match.group(1)
+            # A single request returns the name and artists of every track, so no per-track lookups are needed.
+            response = await asyncio.to_thread(sp.playlist_tracks, pl_id, fields='items.track(name,artists(name))')
+            # Removed or unavailable items have no track, and local files may have no artists.
+            queries = [f"ytsearch:{item['track']['name']} {item['track']['artists'][0]['name']}"
+                       for item in response['items'] if item['track'] and item['track']['artists']]
+            semaphore = asyncio.Semaphore(playlist_concurrency)
+
+            async def get_tracks(q):
+                async with semaphore:
+                    return await get_tracks_cached(player.node, q)
+
+            # The lookups are independent, so run them concurrently; gather keeps the playlist order.
+            results_list = await asyncio.gather(*(get_tracks(q) for q in queries), return_exceptions=True)
+            enqueued = 0
+
+            for q, results in zip(queries, results_list):
+                # BaseException also covers lookups that were cancelled.
+                if isinstance(results, BaseException):
+                    log.warning('Lavalink lookup for %s failed: %r', q, results)
+                    continue
+                if not results or not results['tracks']:
+                    log.debug('Nothing found for %s', q)
+                    continue
+                player.add(requester=ctx.author.id, track=results['tracks'][0])
+                enqueued += 1
+
+            if not enqueued:
+                return await ctx.send('Nothing found!')
+
+            embed = discord.Embed(color=discord.Color.blurple())
+            embed.title = 'Playlist Enqueued!'
+            embed.description = f'{enqueued} tracks'
+            await ctx.send(embed=embed)
+            # There's no single query to search lyrics with, so lyrics falls back to the current title.
+            player.store('source_is_spotify', False)
+            player.store('lyrics_query', None)
+
+            if not player.is_playing:
+                await player.play()
+            return
+        elif not query.startswith(url_prefixes):
+            # Check if the user input might be a URL. If it isn't, we can Lavalink do a YouTube search for it instead.
+            # SoundCloud searching is possible by prefixing "scsearch:" instead.
+            query = f'ytsearch:{query}'
 
         # Get the results for the query from Lavalink.
-        results = await player.node.get_tracks(query)
+        results = await get_tracks_cached(player.node, query)
 
         # Results could be None if Lavalink returns an invalid response (non-JSON/non-200 (OK)).
         # Alternatively, results['tracks'] could be an empty array if the query yielded no tracks.
@@ -261,95 +354,90 @@ class Music(commands.Cog):
             player.add(requester=ctx.author.id, track=track)
 
         await ctx.send(embed=embed)
-        global lyricstitle
-        lyricstitle = query.strip('ytsearch:')
+        # Only search terms make a useful lyrics query; for URLs lyrics falls back to the current title.
+        player.store('source_is_spotify', False)
+        player.store('lyrics_query', query.removeprefix('ytsearch:') if query.startswith('ytsearch:') else None)
         # We don't want to call .play() if the player is playing as that will effectively skip
         # the current track.
         if not player.is_playing:
             await player.play()
 
     @commands.command(aliases=['pu'])
-    async def playuser(self, ctx, member: discord.Member):
+    async def playuser(self, ctx, member: discord.Member = None):
         """ Searches and plays a song from a given query. """
-        # Get the player for this guild from cache.
-        global spotify
-        spotify = True
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        # The guild's player, looked up by cog_before_invoke.
+        player = ctx.player
         if member is None:
             member = ctx.author
-        if member.activities:
-            for activity in member.activities:
-                if isinstance(activity, Spotify):
-                    query = f'{activity.title} {activity.artist}'
-                    global spotifylyrics
-                    spotifylyrics = f'{activity.title} {activity.artist}'
-                    # Check if the user input might be a URL. If it isn't, we can Lavalink do a YouTube search for it instead.
-                    # SoundCloud searching is possible by prefixing "scsearch:" instead.
-
-                    if not url_rx.match(query):
-                        try:
-                            query = f'ytsearch:{query}'
-                        except:
-                            query = f'scsearch:{query}'
-                        spotifylyrics = query
-                    # Get the results for the query from Lavalink.
-                    results = await player.node.get_tracks(query)
-
-                    # Results could be None if Lavalink returns an invalid response (non-JSON/non-200 (OK)).
-                    # ALternatively, resullts['tracks'] could be an empty array if the query yielded no tracks.
-                    if not results or not results['tracks']:
-                        return await ctx.send('Nothing found!')
-
-                    embed = discord.Embed(
-                        color=discord.Color.blurple()
-                    )
-
-                    # Valid loadTypes are:
-                    #   TRACK_LOADED    - single video/direct URL)
-                    #   PLAYLIST_LOADED - direct URL to playlist)
-                    #   SEARCH_RESULT   - query prefixed with either ytsearch: or scsearch:.
-                    #   NO_MATCHES      - query yielded no results
-                    #   LOAD_FAILED     - most likely, the video encountered an exception during loading.
-                    if results['loadType'] == 'PLAYLIST_LOADED':
-                        tracks = results['tracks']
-
-                        for track in tracks:
-                            # Add all of the tracks from the playlist to the queue.
-                            player.add(requester=ctx.author.id, track=track)
-
-                        embed.title = 'Playlist Enqueued!'
-                        embed.description = f'{results["playlistInfo"]["name"]} - {len(tracks)} tracks'
-                    else:
-                        track = results['tracks'][0]
-                        embed.title = 'Track Enqueued'
-                        embed.description = f'[{track["info"]["title"]}]({track["info"]["uri"]})'
-
-                        # You can attach additional information to audiotracks through kwargs, however this involves
-                        # constructing the AudioTrack class yourself.
-                        track = lavalink.models.AudioTrack(track, ctx.author.id, recommended=True)
-                        player.add(requester=ctx.author.id, track=track)
-
-                    await ctx.send(embed=embed)
-
-                    # We don't want to call .play() if the player is playing as that will effectively skip
-                    # the current track.
-                    if not player.is_playing:
-                        await player.play()
-                else:
-                    await ctx.send("Make sure this user has connected discord with spotify and displays their song as a status.")
+
+        activity = next((a for a in (member.activities or ()) if isinstance(a, Spotify)), None)
+        if activity is None:
+            return await ctx.send("Make sure this user has connected discord with spotify and displays their song as a status.")
+
+        lyrics_query = query = f'{activity.title} {activity.artist}'
+
+        # Check if the user input might be a URL. If it isn't, we can Lavalink do a YouTube search for it instead.
+        # SoundCloud searching is possible by prefixing "scsearch:" instead.
+        if not query.startswith(url_prefixes):
+            query = f'ytsearch:{query}'
+
+        # Get the results for the query from Lavalink.
+        results = await get_tracks_cached(player.node, query)
+
+        # Results could be None if Lavalink returns an invalid response (non-JSON/non-200 (OK)).
+        # ALternatively, resullts['tracks'] could be an empty array if the query yielded no tracks.
+        if not results or not results['tracks']:
+            return await ctx.send('Nothing found!')
+
+        # Only update the lyrics state once something is actually enqueued.
+        player.store('source_is_spotify', True)
+        player.store('lyrics_query', lyrics_query)
+
+        embed = discord.Embed(
+            color=discord.Color.blurple()
+        )
+
+        # Valid loadTypes are:
+        #   TRACK_LOADED    - single video/direct URL)
+        #   PLAYLIST_LOADED - direct URL to playlist)
+        #   SEARCH_RESULT   - query prefixed with either ytsearch: or scsearch:.
+        #   NO_MATCHES      - query yielded no results
+        #   LOAD_FAILED     - most likely, the video encountered an exception during loading.
+        if results['loadType'] == 'PLAYLIST_LOADED':
+            tracks = results['tracks']
+
+            for track in tracks:
+                # Add all of the tracks from the playlist to the queue.
+                player.add(requester=ctx.author.id, track=track)
+
+            embed.title = 'Playlist Enqueued!'
+            embed.description = f'{results["playlistInfo"]["name"]} - {len(tracks)} tracks'
+        else:
+            track = results['tracks'][0]
+            embed.title = 'Track Enqueued'
+            embed.description = f'[{track["info"]["title"]}]({track["info"]["uri"]})'
+
+            # You can attach additional information to audiotracks through kwargs, however this involves
+            # constructing the AudioTrack class yourself.
+            track = lavalink.models.AudioTrack(track, ctx.author.id, recommended=True)
+            player.add(requester=ctx.author.id, track=track)
+
+        await ctx.send(embed=embed)
+
+        # We don't want to call .play() if the player is playing as that will effectively skip
+        # the current track.
+        if not player.is_playing:
+            await player.play()
 
     @commands.command(name="Search music", help="Looks for 10 tracks with the given name", aliases=["look", "find"])
     async def search_music(self, ctx, *, search):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
         query = f'ytsearch:{search}'
-        results = await player.node.get_tracks(query)
+        results = await get_tracks_cached(player.node, query)
         tracks = results['tracks'][0:10]
-        i = 0
 
-        query_result = ''
-        for track in tracks:
-            i = i + 1
-            query_result = query_result + f'{i}) {track["info"]["title"]} - {track["info"]["uri"]}\n'
+        query_result = ''.join(f'{i}) {track["info"]["title"]} - {track["info"]["uri"]}\n'
+                               for i, track in enumerate(tracks, start=1))
 
         embed = discord.Embed(
             title=f"Search results for {search}",
@@ -362,7 +450,15 @@ class Music(commands.Cog):
         def check(m):
             return m.author.id == ctx.author.id
 
-        response = await self.bot.wait_for('message', check=check)
+        try:
+            # Don't wait forever, otherwise every unanswered search keeps its results alive.
+            response = await self.bot.wait_for('message', check=check, timeout=30.0)
+        except asyncio.TimeoutError:
+            return await ctx.send('Search cancelled.')
+
+        if not response.content.isdecimal() or not 1 <= int(response.content) <= len(tracks):
+            return
+
         track = tracks[int(response.content) - 1]
 
         player.add(requester=ctx.author.id, track=track)
@@ -372,31 +468,37 @@ class Music(commands.Cog):
 
     @commands.command(name='pause')
     async def pause(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
-        await player.set_pause(True)
+        player = ctx.player
+        # Skip the Lavalink update if nothing would change.
+        if not player.paused:
+            await player.set_pause(True)
         await ctx.message.add_reaction("⏸")
 
     @commands.command(name='resume')
     async def resume(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
-        await player.set_pause(False)
+        player = ctx.player
+        if player.paused:
+            await player.set_pause(False)
         await ctx.message.add_reaction("⏯")
 
     @commands.command(name='volume', help="Set your volume. The limit is set to 1000")
     async def volume(self, ctx, volume: int = 100):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
-        await player.set_volume(volume)
+        player = ctx.player
+        # Lavalink clamps the volume to 0-1000, so compare against the clamped value.
+        volume = max(min(volume, 1000), 0)
+        if volume != player.volume:
+            await player.set_volume(volume)
         await ctx.send(f'🔈 | Set volume to {player.volume}%')
 
     @commands.command()
     async def loop(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
         player.set_repeat(True)
         await ctx.message.add_reaction("🔁")
 
     @commands.command()
     async def unloop(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
         if player.repeat is True:
             player.set_repeat(False)
             await ctx.message.add_reaction("🔁")
@@ -407,7 +509,7 @@ class Music(commands.Cog):
     @commands.command(name="current", description="Shows the current playing song.",
                       aliases=['np', 'nowplaying', "now", "n"])
     async def current(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
         if player.current:
             pos = lavalink.format_time(player.position)
             if player.current.stream:
@@ -441,13 +543,13 @@ class Music(commands.Cog):
 
     @commands.command(help="Skips the current playing song", aliases=["s"], name="skip")
     async def skip(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
         await player.skip()
         await ctx.message.add_reaction("⏭")
 
     @commands.command(aliases=['q'])
     async def queue(self, ctx, page: int = 1):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
 
         if not player.queue:
             return await ctx.send('There\'s nothing in the queue! Why not queue something?')
@@ -458,12 +560,10 @@ class Music(commands.Cog):
         start = (page - 1) * items_per_page
         end = start + items_per_page
 
-        queue_list = ''
-        for i, track in enumerate(player.queue[start:end], start=start):
-            queuetime = lavalink.format_time(track.duration)
-
-        for i, track in enumerate(player.queue[start:end], start=start):
-            queue_list += f'`{i + 1}.` [**{track.title}**]({track.uri})\n'
+        # Lavalink reports the length of live streams as Long.MAX, so they're left out of the total.
+        queuetime = lavalink.format_time(sum(track.duration for track in player.queue if not track.stream))
+        queue_list = ''.join(f'`{i + 1}.` [**{track.title}**]({track.uri})\n'
+                             for i, track in enumerate(islice(player.queue, start, end), start=start))
 
         embed = discord.Embed(
             colour=ctx.guild.me.top_role.colour,
@@ -475,7 +575,7 @@ class Music(commands.Cog):
 
     @commands.command()
     async def remove(self, ctx, index: int):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
 
         if not player.queue:
             return await ctx.send('Nothing queued.')
@@ -490,7 +590,7 @@ class Music(commands.Cog):
 
     @commands.command()
     async def shuffle(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
 
         if not player.is_playing:
             return await ctx.send('Nothing playing.')
@@ -501,87 +601,39 @@ class Music(commands.Cog):
 
     @commands.command(help="Search for the lyrics of a song.", hidden=True)
     async def lyrics(self, ctx, *, song=None):
-        token =
-        genius = Genius(token)
-        genius.remove_section_headers = True
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
-        try:
-            new = player.current.title
-            stopwords = ['(Lyrics)', 'Official', 'Video', '(Official Video)', 'lyrics', ' (Audio)', '(Official Music Video)']
-            lyricwords = new.split()
-
-            resultwords = [word for word in lyricwords if word not in stopwords]
-            titles = ' '.join(resultwords)
-            print(titles)
-        except:
-            new = player.current.title
-            stopwords = ['(lyrics)', 'official', 'video', 'lyrics', '(official  music  video)', '(audio)']
-            lyricwords = new.split()
-
-            resultwords = [word for word in lyricwords if word.lower() not in stopwords]
-            titles = ' '.join(resultwords)
-            print(titles)
+        genius = self.genius
+        player = ctx.player
+        new = player.current.title
+        resultwords = [word for word in new.split() if word.lower() not in lyric_stopwords]
+        titles = ' '.join(resultwords)
+        log.debug('Cleaned up lyrics title: %s', titles)
         if song is None:
-            print(spotify)
-            if spotify == True:
-                print("searching with spotify song data")
-                lyric = genius.search_song(f"{spotifylyrics}")
-                print(lyric)
-                embed = discord.Embed(
-                    title=player.current.title,
-                    description=lyric.lyrics,
-                    colour=discord.Colour.blurple()
-                )
-                await ctx.send(embed=embed)
-            elif spotify == False:
-                try:
-                    search = lyricstitle
-                    lyric = genius.search_song(f"{search}")
-                    embed = discord.Embed(
-                        title=player.current.title,
-                        description=lyric.lyrics,
-                        colour=discord.Colour.blurple()
-                    )
-                    await ctx.send(embed=embed)
-                except:
-                    try:
-                        search0 = titles.split()[0]
-                        search1 = titles.split()[1]
-                        search2 = titles.split()[2]
-                        search3 = titles.split()[3]
-                        search4 = titles.split()[4]
-                        search5 = titles.split()[5]
-                        search = "{}  {}  {}  {}  {}  {}".format(search0, search1, search2, search3, search4, search5)
-                    except:
-                        try:
-                            search0 = titles.split()[0]
-                            search1 = titles.split()[1]
-                            search2 = titles.split()[2]
-                            search3 = titles.split()[3]
-                            search4 = titles.split()[4]
-                            search = "{}  {}  {}  {}  {}".format(search0, search1, search2, search3, search4)
-                        except:
-                            try:
-                                search0 = titles.split()[0]
-                                search1 = titles.split()[1]
-                                search2 = titles.split()[2]
-                                search3 = titles.split()[3]
-                                search = "{}  {}  {}  {}".format(search0, search1, search2, search3)
-                            except:
-                                try:
-                                    search0 = titles.split()[0]
-                                    search1 = titles.split()[1]
-                                    search2 = titles.split()[2]
-                                    search = "{}  {}  {}".format(search0, search1, search2)
-                                except:
-                                    try:
-                                        search0 = titles.split()[0]
-                                        search1 = titles.split()[1]
-                                        search = "{}  {}".format(search0, search1)
-                                    except:
-                                        await ctx.send("Lyrics not Found")
+            # The last query is stored per player, so lyrics lookups in one guild don't see another guild's song.
+            spotify = player.fetch('source_is_spotify')
+            lyrics_query = player.fetch('lyrics_query')
+            log.debug('Searching lyrics for %s (Spotify: %s)', lyrics_query, spotify)
+            lyric = await asyncio.to_thread(genius.search_song, lyrics_query) if lyrics_query else None
+
+            if not lyric:
+                # Fall back to progressively shorter prefixes of the cleaned up track title.
+                words = titles.split()
+                for n in (6, 5, 4, 3, 2):
+                    if len(words) >= n:
+                        lyric = await asyncio.to_thread(genius.search_song, ' '.join(words[:n]))
+                        if lyric:
+                            break
+
+            if not lyric:
+                return await ctx.send("Lyrics not Found")
+
+            embed = discord.Embed(
+                title=player.current.title,
+                description=lyric.lyrics,
+                colour=discord.Colour.blurple()
+            )
+            await ctx.send(embed=embed)
         else:
-            song = genius.search_song(f"{song}")
+            song = await asyncio.to_thread(genius.search_song, song)
             async with ctx.typing():
                 lyrics = discord.Embed(
                     title=f"{song}",
@@ -592,14 +644,12 @@ class Music(commands.Cog):
 
     @commands.command(help="Search for the lyrics of a song.", aliases=['lu'], hidden=True)
     async def lyricsuser(self, ctx, member: discord.Member):
-        token =
-        genius = Genius(token)
-        genius.remove_section_headers = True
+        genius = self.genius
         if member.activities:
             for activity in member.activities:
                 if isinstance(activity, Spotify):
                     song = f'{activity.title}'
-                    lyricsz = genius.search_song(f"{song}")
+                    lyricsz = await asyncio.to_thread(genius.search_song, song)
                     async with ctx.typing():
                         lyrics = discord.Embed(
                             title=f"{song}",
@@ -611,7 +661,7 @@ class Music(commands.Cog):
     @commands.command(name="disconnect", help="Disconnects the player from the voice channel and clears its queue.",
                       aliases=['dc'])
     async def disconnect(self, ctx):
-        player = self.bot.lavalink.player_manager.get(ctx.guild.id)
+        player = ctx.player
 
         if not player.is_connected:
             # We can't disconnect, if we're not connected.
@@ -633,4 +683,25 @@ class Music(commands.Cog):
 
 
 def setup(bot):
+    """
+    Adds the Music cog to the bot.
+    The cog never iterates the member cache. It only reads `ctx.author.voice`, `ctx.guild` and,
+    for `playuser`/`lyricsuser`, `member.activities`, so the bot can be built with a minimal cache:
+
+        intents = discord.Intents.default()  # voice_states is already enabled
+        member_cache_flags = discord.MemberCacheFlags(voice=True, joined=False, online=False)
+        bot = commands.Bot(command_prefix='!', intents=intents, member_cache_flags=member_cache_flags)
+
+    With these flags only members currently in a voice channel are kept in the cache. `online` must be
+    turned off explicitly, as MemberCacheFlags starts with every flag enabled and `online` requires the
+    presences intent.
+
+    discord.py ignores presence updates for members it hasn't cached, so `playuser`/`lyricsuser`
+    need the members and presences intents and `joined=True` to see the activity of members who
+    aren't in a voice channel:
+
+        intents.members = True
+        intents.presences = True
+        member_cache_flags = discord.MemberCacheFlags(voice=True, joined=True, online=True)
+    """
     bot.add_cog(Music(bot))